@@ -1,18 +1,58 @@
+import os
+import asyncio
 import yaml
-from typing import List, Dict, Tuple, Union, Any
+from typing import List, Dict, Tuple, Union, Any, Optional, NoReturn, AsyncIterator
 import openai
+import httpx
 import time
+import random
 import re
 import threading
 import logging
-import traceback
 import json
+import hashlib
+import functools
+from collections import OrderedDict
 from json.decoder import JSONDecodeError
 
 from .types import SamplerBase
 from gigachat import GigaChat
 from gigachat.models import Chat, Messages
 
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:  # PyYAML собран без libyaml
+    from yaml import SafeLoader as _YamlLoader
+
+try:
+    import orjson
+except ImportError:  # orjson - необязательная зависимость для ускорения логирования
+    orjson = None
+
+try:
+    import hyperscan
+except ImportError:  # hyperscan - необязательная зависимость для поиска шаблонов ошибок
+    hyperscan = None
+
+
+def _dumps(obj: Any, indent: bool = False) -> str:
+    """
+    Сериализует объект в JSON-строку для логирования.
+
+    Использует orjson, если он установлен, иначе стандартный модуль json.
+
+    Args:
+        obj: Сериализуемый объект
+        indent: Форматировать ли вывод с отступом в 2 пробела
+
+    Returns:
+        JSON-строка
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(obj, option=option, default=str).decode("utf-8")
+    return json.dumps(obj, ensure_ascii=False, indent=2 if indent else None, default=str)
+
 # Настройка логирования только в файл, без вывода в консоль
 logging.basicConfig(
     level=logging.INFO,
@@ -41,10 +81,188 @@ API_ERROR_PATTERNS = [
     r"^(Error:|Warning:|Exception:|API Error:)",
 ]
 
+# Все шаблоны объединены в одно регулярное выражение, компилируемое один раз
+_ERROR_RE = re.compile(
+    "|".join(f"(?:{pattern})" for pattern in API_ERROR_PATTERNS), re.IGNORECASE
+)
+
+
+def _compile_error_database() -> Any:
+    """
+    Компилирует шаблоны ошибок в базу hyperscan для поиска всех шаблонов за один проход.
+
+    Returns:
+        Экземпляр hyperscan.Database или None, если hyperscan недоступен
+    """
+    if hyperscan is None:
+        return None
+
+    flags = (
+        hyperscan.HS_FLAG_CASELESS
+        | hyperscan.HS_FLAG_SINGLEMATCH
+        | hyperscan.HS_FLAG_UTF8
+        | hyperscan.HS_FLAG_UCP
+    )
+    try:
+        database = hyperscan.Database()
+        database.compile(
+            expressions=[pattern.encode("utf-8") for pattern in API_ERROR_PATTERNS],
+            ids=list(range(len(API_ERROR_PATTERNS))),
+            elements=len(API_ERROR_PATTERNS),
+            flags=[flags] * len(API_ERROR_PATTERNS),
+        )
+    except hyperscan.HyperscanError as e:
+        # Например, если процессор не поддерживает необходимые инструкции
+        logger.warning("Hyperscan is unavailable, falling back to re: %s", e)
+        return None
+    return database
+
+
+_ERROR_DATABASE = _compile_error_database()
+# Scratch-пространство hyperscan нельзя использовать из нескольких потоков одновременно
+_hyperscan_local = threading.local()
+
+
+def _on_error_match(
+    pattern_id: int, start: int, end: int, flags: int, context: List[bool]
+) -> bool:
+    """
+    Обработчик совпадения hyperscan: отмечает найденный шаблон и останавливает поиск.
+    """
+    context[0] = True
+    return True
+
+
+def _search_error_patterns(text: str) -> bool:
+    """
+    Проверяет, содержит ли текст хотя бы один шаблон ошибки.
+
+    Использует hyperscan, если он установлен, иначе общее регулярное выражение.
+
+    Args:
+        text: Текст для проверки
+
+    Returns:
+        True, если найден хотя бы один шаблон
+    """
+    if _ERROR_DATABASE is None:
+        return _ERROR_RE.search(text) is not None
+
+    scratch = getattr(_hyperscan_local, "scratch", None)
+    if scratch is None:
+        scratch = _hyperscan_local.scratch = hyperscan.Scratch(_ERROR_DATABASE)
+
+    found = [False]
+    try:
+        _ERROR_DATABASE.scan(
+            text.encode("utf-8", "ignore"),
+            match_event_handler=_on_error_match,
+            context=found,
+            scratch=scratch,
+        )
+    except hyperscan.ScanTerminated:
+        # Поиск остановлен обработчиком после первого совпадения
+        pass
+    return found[0]
+
 
 # Параметры повтора для ошибок JSON
 JSON_ERROR_MAX_RETRY = 12  # Максимальное количество повторов при ошибках JSON
 JSON_ERROR_RETRY_DELAY = 5  # Начальная задержка между повторами (в секундах)
+RETRY_MAX_DELAY = 30.0  # Верхняя граница задержки между повторами (в секундах)
+# Повторы сетевых ошибок, таймаутов, 429 и 5xx внутри клиента OpenAI. Каждый повтор
+# может ждать полный таймаут чтения, поэтому значение держим небольшим (как в SDK)
+OPENAI_CLIENT_MAX_RETRY = 2
+
+
+def _backoff(
+    attempt: int, base: float, cap: float = RETRY_MAX_DELAY, jitter: float = 0.5
+) -> float:
+    """
+    Вычисляет задержку перед повтором: экспоненциальный рост с ограничением и джиттером.
+
+    Args:
+        attempt: Номер повтора, начиная с 0
+        base: Базовая задержка в секундах
+        cap: Максимальная задержка без учета джиттера
+        jitter: Максимальная относительная случайная добавка к задержке
+
+    Returns:
+        Задержка в секундах
+    """
+    return min(cap, base * (2**attempt)) * (1 + random.uniform(0, jitter))
+
+
+# Размер пула HTTP-соединений, общего для всех запросов через один клиент OpenAI
+HTTP_POOL_LIMITS = httpx.Limits(max_keepalive_connections=64, max_connections=128)
+
+
+def _openai_client_kwargs(
+    api_key: str, base_url: Optional[str], timeout: Optional[float]
+) -> Dict[str, Any]:
+    """
+    Собирает общие параметры для синхронного и асинхронного клиентов OpenAI.
+
+    Args:
+        api_key: Ключ API
+        base_url: Базовый URL API или None для адреса по умолчанию
+        timeout: Таймаут чтения ответа в секундах или None для значения по умолчанию
+
+    Returns:
+        Словарь именованных аргументов для openai.OpenAI / openai.AsyncOpenAI
+    """
+    return {
+        "api_key": api_key,
+        "base_url": base_url or None,
+        "max_retries": OPENAI_CLIENT_MAX_RETRY,
+        "timeout": (
+            httpx.Timeout(timeout, connect=5.0) if timeout else openai.DEFAULT_TIMEOUT
+        ),
+    }
+
+
+async def _close_on_loop_shutdown(client: Any) -> AsyncIterator[None]:
+    """
+    Асинхронный генератор, закрывающий клиент при завершении цикла событий.
+
+    asyncio.run перед закрытием цикла вызывает loop.shutdown_asyncgens(), который
+    завершает незавершенные асинхронные генераторы, пока цикл еще работает.
+    Соединения клиента можно корректно закрыть только в их собственном цикле.
+
+    Args:
+        client: Асинхронный клиент с методом close()
+    """
+    try:
+        yield
+    finally:
+        await client.close()
+
+
+class UnexpectedResponseError(TypeError):
+    """
+    Ответ API получен, но его структура не позволяет извлечь текст ответа.
+    """
+
+
+@functools.lru_cache(maxsize=32)
+def _load_config(path: str, mtime_ns: int, size: int) -> Dict[str, Any]:
+    """
+    Читает и разбирает YAML-конфигурацию.
+
+    Результат кэшируется по пути, времени изменения и размеру файла, поэтому
+    повторное создание сэмплеров не перечитывает неизменившийся конфиг.
+    Возвращаемый словарь общий для всех вызовов и не должен изменяться.
+
+    Args:
+        path: Путь к файлу конфигурации YAML
+        mtime_ns: Время последнего изменения файла в наносекундах
+        size: Размер файла в байтах
+
+    Returns:
+        Словарь с конфигурацией
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        return yaml.load(f, Loader=_YamlLoader)
 
 
 # Глобальный счетчик времени для контроля интервалов между запросами
@@ -53,42 +271,151 @@ class RateLimiter:
     Класс для ограничения частоты запросов к API.
     
     Используется для соблюдения ограничений API и предотвращения лимитов скорости.
+    Реализует алгоритм token bucket: в среднем разрешается не более одного запроса
+    за delay секунд, но до capacity запросов могут быть отправлены подряд.
     """
     
-    def __init__(self, delay: float = 0.0):
+    def __init__(self, delay: float = 0.0, capacity: int = 1):
         """
         Инициализирует ограничитель скорости запросов.
         
         Args:
-            delay: Минимальная задержка между запросами в секундах
+            delay: Минимальная средняя задержка между запросами в секундах
+            capacity: Максимальное количество запросов, отправляемых без задержки
         """
         self.delay = delay
-        self.last_request_time = 0
-        self.lock = threading.Lock()
+        self.capacity = max(1, capacity)
+        self.fill_rate = 1.0 / delay if delay > 0 else 0.0
+        self.tokens = float(self.capacity)
+        self.time = time.monotonic()
+        self.lock = threading.RLock()
+
+    def _try_acquire(self) -> float:
+        """
+        Пытается забрать токен для очередного запроса.
+
+        Returns:
+            0, если токен получен, иначе время в секундах до появления токена
+        """
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(
+                self.capacity, self.tokens + (now - self.time) * self.fill_rate
+            )
+            self.time = now
+
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0.0
+
+            wait_time = (1 - self.tokens) / self.fill_rate
+
+        if wait_time > 0.1:  # Не логируем очень короткие задержки
+            logger.debug("Waiting %.2fs before next API call", wait_time)
+        return wait_time
 
     def wait_if_needed(self) -> None:
         """
         Ожидает, если необходимо, перед следующим запросом для соблюдения заданной задержки.
         
-        Если с момента последнего запроса прошло меньше времени, чем указано в delay,
-        функция блокируется до достижения нужной задержки.
+        Если свободных токенов нет, функция блокируется до их пополнения. Блокировка
+        не удерживается во время ожидания, поэтому другие потоки не сериализуются.
+        """
+        if self.delay <= 0:
+            return
+
+        while (wait_time := self._try_acquire()) > 0:
+            time.sleep(wait_time)
+
+    async def async_wait_if_needed(self) -> None:
+        """
+        Асинхронный аналог wait_if_needed, не блокирующий цикл событий во время ожидания.
         """
         if self.delay <= 0:
             return
 
+        while (wait_time := self._try_acquire()) > 0:
+            await asyncio.sleep(wait_time)
+
+
+class ResponseCache:
+    """
+    Потокобезопасный LRU-кэш ответов API с ограниченным временем жизни записей.
+
+    Позволяет не повторять идентичные детерминированные запросы к модели.
+    """
+
+    def __init__(self, maxsize: int = 4096, ttl: float = 3600.0):
+        """
+        Инициализирует кэш ответов.
+
+        Args:
+            maxsize: Максимальное количество хранимых ответов
+            ttl: Время жизни записи в секундах
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def make_key(**params: Any) -> str:
+        """
+        Строит стабильный ключ кэша по параметрам запроса.
+
+        Args:
+            **params: Параметры запроса, влияющие на ответ модели
+
+        Returns:
+            Шестнадцатеричный хэш параметров
+        """
+        payload = json.dumps(params, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Возвращает сохраненное значение или None, если его нет или оно устарело.
+
+        Args:
+            key: Ключ кэша
+
+        Returns:
+            Сохраненное значение или None
+        """
         with self.lock:
-            current_time = time.time()
-            elapsed = current_time - self.last_request_time
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any) -> None:
+        """
+        Сохраняет значение в кэше, вытесняя самые старые записи при переполнении.
 
-            # Если прошло меньше времени, чем задержка, ждем
-            if elapsed < self.delay:
-                wait_time = self.delay - elapsed
-                if wait_time > 0.1:  # Не логируем очень короткие задержки
-                    logger.debug(f"Waiting {wait_time:.2f}s before next API call")
-                time.sleep(wait_time)
+        Args:
+            key: Ключ кэша
+            value: Сохраняемое значение
+        """
+        with self.lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
 
-            # Обновляем время последнего запроса
-            self.last_request_time = time.time()
+
+@functools.lru_cache(maxsize=64)
+def _has_to_dict(response_type: type) -> bool:
+    """
+    Проверяет, есть ли у типа ответа вызываемый метод to_dict.
+
+    Результат кэшируется по типу, чтобы не повторять поиск атрибутов.
+    """
+    return callable(getattr(response_type, "to_dict", None))
 
 
 def safe_response_dump(response: Any) -> str:
@@ -109,17 +436,17 @@ def safe_response_dump(response: Any) -> str:
 
     try:
         # Если у объекта есть метод to_dict или __dict__
-        if hasattr(response, "to_dict") and callable(getattr(response, "to_dict")):
+        if _has_to_dict(type(response)):
             response_dict = response.to_dict()
-            return json.dumps(response_dict, ensure_ascii=False, indent=2, default=str)
+            return _dumps(response_dict, indent=True)
         elif hasattr(response, "__dict__"):
             response_dict = response.__dict__
             # Фильтруем внутренние атрибуты, начинающиеся с '_'
             filtered_dict = {k: v for k, v in response_dict.items() if not k.startswith('_')}
-            return json.dumps(filtered_dict, ensure_ascii=False, indent=2, default=str)
+            return _dumps(filtered_dict, indent=True)
         # Если это словарь или другой тип, который можно сериализовать
         elif isinstance(response, (dict, list, str, int, float, bool)):
-            return json.dumps(response, ensure_ascii=False, indent=2, default=str)
+            return _dumps(response, indent=True)
         else:
             # Для всех остальных типов преобразуем в строку
             return f"{type(response).__name__}: {str(response)}"
@@ -128,6 +455,108 @@ def safe_response_dump(response: Any) -> str:
         return f"[Error serializing {type(response).__name__}: {str(e)}]"
 
 
+def _extract_usage(response: Any) -> Dict[str, int]:
+    """
+    Извлекает информацию об использованных токенах из ответа API.
+
+    Поддерживает объекты с атрибутом usage и ответы в виде словаря.
+
+    Args:
+        response: Объект ответа API
+
+    Returns:
+        Словарь с количеством токенов (prompt_tokens, completion_tokens, total_tokens)
+        или {"total_tokens": 0}, если информация отсутствует
+    """
+    if isinstance(response, dict):
+        usage = response.get("usage")
+    else:
+        usage = getattr(response, "usage", None)
+    if not usage:
+        return {"total_tokens": 0}
+
+    if isinstance(usage, dict):
+        get = usage.get
+    else:
+        get = lambda key: getattr(usage, key, 0)  # noqa: E731
+    return {
+        "prompt_tokens": get("prompt_tokens") or 0,
+        "completion_tokens": get("completion_tokens") or 0,
+        "total_tokens": get("total_tokens") or 0,
+    }
+
+
+def _extract_finish_reason(response: Any) -> Optional[str]:
+    """
+    Извлекает причину завершения генерации (finish_reason) из ответа API.
+
+    Args:
+        response: Объект ответа API
+
+    Returns:
+        Значение finish_reason первого варианта ответа или None, если его нет
+    """
+    try:
+        choice = response.choices[0]
+    except (AttributeError, IndexError, KeyError, TypeError):
+        choices = response.get("choices") if isinstance(response, dict) else None
+        if isinstance(choices, list) and choices and isinstance(choices[0], dict):
+            return choices[0].get("finish_reason")
+        return None
+    return getattr(choice, "finish_reason", None)
+
+
+def _extract_content_slow(response: Any) -> str:
+    """
+    Извлекает текст ответа из нестандартных форматов ответа API.
+
+    Используется, когда ответ не имеет структуры response.choices[0].message.content.
+
+    Args:
+        response: Объект ответа API
+
+    Returns:
+        Текст ответа модели
+
+    Raises:
+        UnexpectedResponseError: Если извлечь текст ответа не удалось
+    """
+    # Ответ в виде словаря
+    if isinstance(response, dict):
+        choices = response.get("choices")
+        if isinstance(choices, list) and choices and isinstance(choices[0], dict):
+            message = choices[0].get("message")
+            if isinstance(message, dict) and "content" in message:
+                return message["content"]
+
+    # Ответ уже является строкой
+    if isinstance(response, str):
+        return response
+
+    # Последняя попытка получить ответ
+    if hasattr(response, "content"):
+        return response.content
+
+    raise UnexpectedResponseError(
+        "Unexpected response structure: Failed to extract response content. "
+        f"Response type: {type(response)}"
+    )
+
+
+class _LazyDump:
+    """
+    Обертка, откладывающая сериализацию ответа до фактической записи в лог.
+    """
+
+    __slots__ = ("response",)
+
+    def __init__(self, response: Any):
+        self.response = response
+
+    def __str__(self) -> str:
+        return safe_response_dump(self.response)
+
+
 class OaiSampler(SamplerBase):
     """
     Класс для взаимодействия с различными API языковых моделей.
@@ -138,11 +567,140 @@ class OaiSampler(SamplerBase):
     """
     
     # Создаем словарь ограничителей скорости для разных моделей API
-    _rate_limiters = {}
+    _rate_limiters: Dict[Tuple[str, str], RateLimiter] = {}
     _rate_limiters_lock = threading.Lock()
 
+    # Общий для всех экземпляров кэш ответов на детерминированные запросы
+    _response_cache = ResponseCache()
+
+    # Выполняющиеся сейчас детерминированные запросы: ключ кэша -> (событие, исход).
+    # Исход - ("ok", (ответ, метаданные)) или ("error", исключение ведущего запроса)
+    _inflight: Dict[str, Tuple[threading.Event, List[Tuple[str, Any]]]] = {}
+    _inflight_lock = threading.Lock()
+
+    # Клиенты API, разделяемые между экземплярами с одинаковыми параметрами подключения,
+    # чтобы переиспользовать пул HTTP-соединений и токен авторизации
+    _clients: Dict[Tuple, Any] = {}
+    _clients_lock = threading.Lock()
+
+    # Асинхронные клиенты OpenAI: (цикл событий, base_url, ключ API, таймаут) ->
+    # (клиент, генератор, закрывающий клиент при завершении цикла)
+    _async_clients: Dict[
+        Tuple[asyncio.AbstractEventLoop, str, str, Optional[float]],
+        Tuple[openai.AsyncOpenAI, AsyncIterator[None]],
+    ] = {}
+
     @classmethod
-    def get_rate_limiter(cls, api_type: str, model_name: str, delay: float) -> RateLimiter:
+    def get_openai_client(
+        cls, api_key: str, base_url: Optional[str], timeout: Optional[float] = None
+    ) -> openai.OpenAI:
+        """
+        Получает общий клиент OpenAI для указанного ключа и адреса API.
+
+        Повторы при сетевых ошибках, 429 и 5xx выполняет сам клиент с учетом Retry-After.
+
+        Args:
+            api_key: Ключ API
+            base_url: Базовый URL API или None для адреса по умолчанию
+            timeout: Таймаут чтения ответа в секундах или None для значения по умолчанию
+
+        Returns:
+            Экземпляр openai.OpenAI с общим пулом соединений
+        """
+        key = ("openai", base_url or "", api_key, timeout)
+        with cls._clients_lock:
+            client = cls._clients.get(key)
+            if client is None:
+                client = openai.OpenAI(
+                    **_openai_client_kwargs(api_key, base_url, timeout),
+                    http_client=openai.DefaultHttpxClient(limits=HTTP_POOL_LIMITS),
+                )
+                cls._clients[key] = client
+            return client
+
+    @classmethod
+    async def get_async_openai_client(
+        cls, api_key: str, base_url: Optional[str], timeout: Optional[float] = None
+    ) -> openai.AsyncOpenAI:
+        """
+        Получает общий асинхронный клиент OpenAI для текущего цикла событий.
+
+        Соединения httpx.AsyncClient привязаны к циклу событий, поэтому клиенты
+        хранятся отдельно для каждого цикла и закрываются при его завершении.
+        Клиенты из уже закрытых циклов событий удаляются.
+
+        Args:
+            api_key: Ключ API
+            base_url: Базовый URL API или None для адреса по умолчанию
+            timeout: Таймаут чтения ответа в секундах или None для значения по умолчанию
+
+        Returns:
+            Экземпляр openai.AsyncOpenAI с общим пулом соединений
+        """
+        loop = asyncio.get_running_loop()
+        key = (loop, base_url or "", api_key, timeout)
+        stale_clients = []
+        with cls._clients_lock:
+            entry = cls._async_clients.get(key)
+            if entry is not None:
+                return entry[0]
+
+            client = openai.AsyncOpenAI(
+                **_openai_client_kwargs(api_key, base_url, timeout),
+                http_client=openai.DefaultAsyncHttpxClient(limits=HTTP_POOL_LIMITS),
+            )
+            # Цикл событий хранит асинхронные генераторы по слабым ссылкам,
+            # поэтому генератор, закрывающий клиент, храним вместе с ним
+            closer = _close_on_loop_shutdown(client)
+            cls._async_clients[key] = (client, closer)
+
+            for other_key in list(cls._async_clients):
+                if other_key[0].is_closed():
+                    stale_clients.append(cls._async_clients.pop(other_key)[0])
+
+        # Запускаем генератор, чтобы цикл событий завершил его при своем закрытии
+        await closer.__anext__()
+
+        # Цикл закрыт без shutdown_asyncgens: пытаемся закрыть клиент хотя бы здесь
+        for stale_client in stale_clients:
+            if stale_client.is_closed():
+                continue
+            try:
+                await stale_client.close()
+            except Exception as e:
+                logger.debug("Failed to close stale async OpenAI client: %s", e)
+        return client
+
+    @classmethod
+    def get_gigachat_client(cls, model: str, **api_dict: Any) -> GigaChat:
+        """
+        Получает общий клиент GigaChat для указанной модели и параметров подключения.
+
+        Args:
+            model: Название модели GigaChat
+            **api_dict: Параметры подключения (credentials, base_url, scope и др.)
+
+        Returns:
+            Экземпляр GigaChat, переиспользующий соединение и токен доступа
+        """
+        credentials_hash = hashlib.sha256(
+            str(api_dict.get("credentials")).encode("utf-8")
+        ).hexdigest()
+        params = tuple(
+            sorted((k, v) for k, v in api_dict.items() if k != "credentials")
+        )
+        key = ("gigachat", model, credentials_hash, params)
+        with cls._clients_lock:
+            client = cls._clients.get(key)
+            if client is None:
+                client = GigaChat(model=model, verify_ssl_certs=False, **api_dict)
+                cls._clients[key] = client
+            return client
+
+    @classmethod
+    def get_rate_limiter(
+        cls, api_type: str, model_name: str, delay: float, capacity: int = 1
+    ) -> RateLimiter:
         """
         Получает ограничитель скорости для конкретного API и модели.
         
@@ -150,15 +708,21 @@ class OaiSampler(SamplerBase):
             api_type: Тип API (openai, gigachat и др.)
             model_name: Название модели
             delay: Задержка между запросами
+            capacity: Количество запросов, которые можно отправить подряд без задержки
             
         Returns:
             Экземпляр RateLimiter для указанной комбинации API и модели
         """
-        key = f"{api_type}_{model_name}"
-        with cls._rate_limiters_lock:
-            if key not in cls._rate_limiters:
-                cls._rate_limiters[key] = RateLimiter(delay)
-            return cls._rate_limiters[key]
+        key = (api_type, model_name)
+        # Чтение словаря атомарно, поэтому блокировка нужна только при создании
+        rate_limiter = cls._rate_limiters.get(key)
+        if rate_limiter is None:
+            with cls._rate_limiters_lock:
+                rate_limiter = cls._rate_limiters.get(key)
+                if rate_limiter is None:
+                    rate_limiter = RateLimiter(delay, capacity)
+                    cls._rate_limiters[key] = rate_limiter
+        return rate_limiter
 
     def __init__(self, config_path: str):
         """
@@ -171,8 +735,8 @@ class OaiSampler(SamplerBase):
             ValueError: Если в конфигурации отсутствуют необходимые параметры аутентификации
         """
         # Загружаем конфиг
-        with open(config_path, "r") as f:
-            self.config = yaml.safe_load(f)
+        stat = os.stat(config_path)
+        self.config = _load_config(config_path, stat.st_mtime_ns, stat.st_size)
 
         # Получаем параметры для выбранной модели
         model_name = self.config["model_list"][0]  # Берем первую модель из списка
@@ -196,6 +760,8 @@ class OaiSampler(SamplerBase):
             self.scope = endpoint.get("scope", "GIGACHAT_API_CORP")
             self.profanity_check = endpoint.get("profanity_check", True)
             self.timeout = endpoint.get("timeout", 60.0)
+            # Для OpenAI таймаут задаем только явно: генерация длинного ответа может идти дольше 60 секунд
+            openai_timeout = endpoint.get("timeout")
         else:
             self.api_key = self.config.get("api_key")
             self.credentials = None
@@ -203,6 +769,7 @@ class OaiSampler(SamplerBase):
             self.scope = "GIGACHAT_API_CORP"
             self.profanity_check = True
             self.timeout = 60.0
+            openai_timeout = None
 
         # Проверка наличия необходимых учетных данных
         if self.api_type == "openai" and not self.api_key:
@@ -213,12 +780,10 @@ class OaiSampler(SamplerBase):
         # Инициализируем клиент OpenAI если нужно
         self.client = None
         if self.api_type == "openai":
-            if self.base_url:
-                self.client = openai.OpenAI(
-                    api_key=self.api_key, base_url=self.base_url
-                )
-            else:
-                self.client = openai.OpenAI(api_key=self.api_key)
+            self.client = self.get_openai_client(
+                self.api_key, self.base_url, openai_timeout
+            )
+        self._openai_timeout = openai_timeout
 
         self.model_name = self.model_config.get("model_name", model_name)
         self.temperature = self.config.get("temperature", 0.0)
@@ -229,28 +794,53 @@ class OaiSampler(SamplerBase):
             "max_tokens", self.config.get("max_tokens", 2048)
         )
 
+        # Неизменные аргументы запроса к OpenAI API, к ним добавляются только сообщения
+        self._api_args_template: Dict[str, Any] = {
+            "model": self.model_name,
+            "temperature": self.temperature,
+        }
+        # Add max_tokens only if it has a value
+        if self.max_tokens is not None:
+            self._api_args_template["max_tokens"] = self.max_tokens
+
         self.system_prompt = self.model_config.get("system_prompt", None)
+        # Системное сообщение не меняется за время жизни сэмплера, упаковываем его один раз
+        self._system_messages: Tuple[Dict[str, str], ...] = (
+            (self._pack_message(content=self.system_prompt, role="system"),)
+            if self.system_prompt
+            else ()
+        )
         self.debug = self.config.get("debug", False)
+        # Количество одновременных запросов в abatch по умолчанию
+        self.parallel = self.model_config.get("parallel", 1)
+
+        # Кэшировать ответы имеет смысл только при детерминированной генерации
+        self.cache_enabled = (
+            self.config.get("cache_enabled", True) and self.temperature == 0
+        )
 
         # Получаем задержку между запросами для модели или используем общее значение
         self.request_delay = self.model_config.get(
             "request_delay", self.config.get("request_delay", 0.0)
         )
+        self.burst_capacity = self.model_config.get(
+            "burst_capacity", self.config.get("burst_capacity", 1)
+        )
 
         # Инициализируем ограничитель скорости для этой модели
         self.rate_limiter = self.get_rate_limiter(
-            self.api_type, self.model_name, self.request_delay
+            self.api_type, self.model_name, self.request_delay, self.burst_capacity
         )
 
         if self.debug:
-            logger.debug(f"Initialized OaiSampler for {self.model_name}")
-            logger.debug(f"API Type: {self.api_type}")
-            logger.debug(f"Base URL: {self.base_url}")
-            logger.debug(f"Request delay: {self.request_delay} sec")
+            logger.debug("Initialized OaiSampler for %s", self.model_name)
+            logger.debug("API Type: %s", self.api_type)
+            logger.debug("Base URL: %s", self.base_url)
+            logger.debug("Request delay: %s sec", self.request_delay)
             if self.api_key:
-                logger.debug(f"API Key: {self.api_key[:8]}...")
+                logger.debug("API Key: %s...", self.api_key[:8])
             elif self.credentials:
-                logger.debug(f"Using credentials for {self.api_type}")
+                logger.debug("Using credentials for %s", self.api_type)
 
     def _pack_message(self, content: str, role: str = "user") -> Dict[str, str]:
         """
@@ -265,6 +855,26 @@ class OaiSampler(SamplerBase):
         """
         return {"role": role, "content": content}
 
+    def _cache_key(self, messages: List[Dict[str, str]]) -> str:
+        """
+        Строит ключ кэша ответов для запроса с указанными сообщениями.
+
+        Args:
+            messages: Список сообщений для диалога с моделью (без системного промпта)
+
+        Returns:
+            Ключ для ResponseCache
+        """
+        return ResponseCache.make_key(
+            api_type=self.api_type,
+            base_url=self.base_url,
+            model=self.model_name,
+            temperature=self.temperature,
+            max_tokens=self.max_tokens,
+            system_prompt=self.system_prompt,
+            messages=messages,
+        )
+
     def contains_error_patterns(self, text: str) -> bool:
         """
         Проверяет наличие шаблонов ошибок в тексте.
@@ -278,10 +888,7 @@ class OaiSampler(SamplerBase):
         if not text:
             return True  # Пустой ответ - тоже ошибка
 
-        for pattern in API_ERROR_PATTERNS:
-            if re.search(pattern, text, re.IGNORECASE):
-                return True
-        return False
+        return _search_error_patterns(text)
 
     def chat_completion_gigachat(
         self,
@@ -289,7 +896,8 @@ class OaiSampler(SamplerBase):
         messages: List[Dict[str, str]],
         temperature: float,
         max_tokens: int,
-    ) -> Tuple[str, Dict[str, int]]:
+        return_status: bool = False,
+    ) -> Union[Tuple[str, Dict[str, int]], Tuple[str, Dict[str, int], bool]]:
         """
         Обработка запроса к GigaChat API с улучшенным механизмом повторных попыток.
 
@@ -298,9 +906,11 @@ class OaiSampler(SamplerBase):
             messages: Список сообщений для контекста
             temperature: Параметр температуры для генерации (случайность)
             max_tokens: Максимальное количество токенов в ответе
+            return_status: Флаг для возврата признака успешного запроса
 
         Returns:
-            Кортеж (текст_ответа, метаданные)
+            При return_status=False: кортеж (текст_ответа, метаданные)
+            При return_status=True: кортеж (текст_ответа, метаданные, успех)
         """
         # Создаем api_dict для GigaChat из унифицированных параметров
         api_dict = {
@@ -313,12 +923,13 @@ class OaiSampler(SamplerBase):
 
         output: str = API_ERROR_OUTPUT
         metadata: Dict[str, int] = {"total_tokens": 0}
+        succeeded: bool = False
 
         # Записываем в лог краткую информацию о запросе
-        logger.info(f"API request: [{model}] (GigaChat)")
+        logger.info("API request: [%s] (GigaChat)", model)
 
-        # Создаем клиент и настраиваем параметры только один раз перед циклом
-        client = GigaChat(model=model, verify_ssl_certs=False, **api_dict)
+        # Получаем общий клиент, чтобы не проходить авторизацию при каждом вызове
+        client = self.get_gigachat_client(model, **api_dict)
 
         # Настраиваем параметры для GigaChat
         top_p: float = 1
@@ -326,8 +937,11 @@ class OaiSampler(SamplerBase):
             temperature = 1
             top_p = 0
 
-        # Преобразуем сообщения в формат GigaChat
-        giga_messages = [Messages.parse_obj(m) for m in messages]
+        # Преобразуем сообщения в формат GigaChat без повторной валидации:
+        # структуру сообщений уже гарантирует _pack_message
+        giga_messages = [
+            Messages.construct(role=m["role"], content=m["content"]) for m in messages
+        ]
         chat = Chat(
             messages=giga_messages,
             max_tokens=max_tokens,
@@ -337,13 +951,15 @@ class OaiSampler(SamplerBase):
 
         # Максимальное количество повторных попыток
         for attempt in range(API_MAX_RETRY):
-            # Прогрессивное увеличение времени между попытками
+            # Экспоненциальное увеличение времени между попытками
             if attempt > 0:
-                retry_delay: float = API_RETRY_SLEEP * (
-                    1 + attempt * 0.5
-                )  # Увеличиваем задержку с каждой попыткой
+                retry_delay: float = _backoff(attempt - 1, API_RETRY_SLEEP)
                 logger.info(
-                    f"Model [{model}]: Retry #{attempt + 1}/{API_MAX_RETRY}, delay: {retry_delay:.1f}s"
+                    "Model [%s]: Retry #%d/%d, delay: %.1fs",
+                    model,
+                    attempt + 1,
+                    API_MAX_RETRY,
+                    retry_delay,
                 )
                 time.sleep(retry_delay)
 
@@ -353,63 +969,199 @@ class OaiSampler(SamplerBase):
 
                 # Проверяем содержимое ответа на наличие шаблонов ошибок
                 if self.contains_error_patterns(output):
-                    error_msg = output.strip()  # Удаляем пробелы по краям
-                    log_content = error_msg[:100] + "..." if len(error_msg) > 100 else error_msg
                     logger.warning(
-                        f"Model [{model}] (attempt {attempt + 1}): Error pattern in response"
+                        "Model [%s] (attempt %d): Error pattern in response",
+                        model,
+                        attempt + 1,
                     )
                     # Логируем полный ответ при обнаружении ошибки
-                    logger.warning(f"Full response: {safe_response_dump(response)}")
+                    logger.warning("Full response: %s", _LazyDump(response))
                     
                     if attempt < API_MAX_RETRY - 1:
                         continue  # Повторяем запрос
                     else:  # Если это последняя попытка и ответ содержит ошибку
+                        error_msg = (output or "").strip()  # Удаляем пробелы по краям
+                        log_content = (
+                            error_msg[:100] + "..." if len(error_msg) > 100 else error_msg
+                        )
                         output = f"API returned error pattern: {log_content}"  # Обновляем вывод для возврата
                         break  # Прерываем цикл после последней попытки
 
                 # Извлекаем информацию о токенах
-                if hasattr(response, "usage") and response.usage:
-                    metadata["prompt_tokens"] = getattr(
-                        response.usage, "prompt_tokens", 0
-                    )
-                    metadata["completion_tokens"] = getattr(
-                        response.usage, "completion_tokens", 0
-                    )
-                    metadata["total_tokens"] = getattr(
-                        response.usage, "total_tokens", 0
-                    )
+                metadata = _extract_usage(response)
 
                 # Записываем в лог только краткую информацию о успешном запросе
                 logger.info(
-                    f"Model [{model}]: Success, tokens: {metadata['total_tokens']}"
+                    "Model [%s]: Success, tokens: %s", model, metadata["total_tokens"]
                 )
 
                 # Успешно получен ответ без ошибок в содержимом
+                succeeded = True
                 break
 
             except Exception as e:
                 # При ошибке логируем только ключевую информацию и полный JSON ответа
-                logger.error(f"Model [{model}] (attempt {attempt + 1}): {type(e).__name__}: {str(e)}")
+                logger.error(
+                    "Model [%s] (attempt %d): %s: %s",
+                    model,
+                    attempt + 1,
+                    type(e).__name__,
+                    e,
+                )
                 
                 # Логируем полный ответ API при ошибке
-                error_json = {
-                    "error_type": type(e).__name__,
-                    "error_message": str(e),
-                    "request_model": model,
-                    "temperature": temperature,
-                    "max_tokens": max_tokens,
-                    "attempt": attempt + 1,
-                    "total_attempts": API_MAX_RETRY
-                }
-                logger.error(f"Error details: {json.dumps(error_json, ensure_ascii=False)}")
+                if logger.isEnabledFor(logging.ERROR):
+                    error_json = {
+                        "error_type": type(e).__name__,
+                        "error_message": str(e),
+                        "request_model": model,
+                        "temperature": temperature,
+                        "max_tokens": max_tokens,
+                        "attempt": attempt + 1,
+                        "total_attempts": API_MAX_RETRY
+                    }
+                    logger.error("Error details: %s", _dumps(error_json))
 
                 # Если это последняя попытка, фиксируем ошибку
                 if attempt == API_MAX_RETRY - 1:
-                    logger.error(f"Model [{model}]: All {API_MAX_RETRY} retry attempts exhausted")
+                    logger.error(
+                        "Model [%s]: All %d retry attempts exhausted", model, API_MAX_RETRY
+                    )
                     output = f"Error during API call: {str(e)}"
 
+        if return_status:
+            return output, metadata, succeeded
         return output, metadata
 
+    def _lookup_cache(
+        self, messages: List[Dict[str, str]]
+    ) -> Tuple[Optional[str], Optional[Tuple[str, Dict[str, int]]]]:
+        """
+        Ищет ответ на запрос в кэше ответов.
+
+        Args:
+            messages: Список сообщений для диалога с моделью (без системного промпта)
+
+        Returns:
+            Кортеж (ключ_кэша, (ответ, метаданные)); ключ равен None, если кэш отключен,
+            а второй элемент равен None, если ответа в кэше нет
+        """
+        if not self.cache_enabled:
+            return None, None
+
+        cache_key = self._cache_key(messages)
+        cached = self._response_cache.get(cache_key)
+        if cached is None:
+            return cache_key, None
+        result, metadata = cached
+        return cache_key, (result, dict(metadata))
+
+    def _store_in_cache(
+        self, cache_key: Optional[str], result: str, metadata: Dict[str, int]
+    ) -> None:
+        """
+        Сохраняет ответ в кэше, если кэширование включено и ответ не содержит ошибок.
+
+        Args:
+            cache_key: Ключ, полученный из _lookup_cache
+            result: Текст ответа модели
+            metadata: Метаданные ответа
+        """
+        # Ответы с признаками ошибки не кэшируем, чтобы повторный запрос ушел в API
+        if cache_key is not None and not self.contains_error_patterns(result):
+            self._response_cache.set(cache_key, (result, dict(metadata)))
+
+    def _prepare_messages(
+        self, messages: List[Dict[str, str]]
+    ) -> List[Dict[str, str]]:
+        """
+        Добавляет системный промпт к сообщениям и логирует запрос в режиме отладки.
+
+        Args:
+            messages: Список сообщений для диалога с моделью
+
+        Returns:
+            Список сообщений, готовый к отправке в API
+        """
+        if self.debug:
+            msg_preview = (
+                messages[0]["content"][:50] + "..."
+                if messages and len(messages[0]["content"]) > 50
+                else ""
+            )
+            logger.debug(
+                "Sending request to %s, first message: %s", self.model_name, msg_preview
+            )
+
+        # Добавляем system prompt если он есть
+        if self._system_messages:
+            messages = [*self._system_messages, *messages]
+        return messages
+
+    def _openai_retry_delay(
+        self,
+        attempt: int,
+        result: Optional[str] = None,
+        error: Optional[Exception] = None,
+        finish_reason: Optional[str] = None,
+    ) -> Optional[float]:
+        """
+        Решает, нужно ли повторить запрос к OpenAI API, и вычисляет задержку.
+
+        Сетевые ошибки, 429 и 5xx повторяет клиент OpenAI, здесь повторяются только
+        некорректные тела ответов и ответы, содержащие текст ошибки. Пустые и
+        обрезанные по max_tokens ответы возвращаются сразу: при повторе они
+        воспроизводятся снова.
+
+        Args:
+            attempt: Номер текущей попытки, начиная с 0
+            result: Текст ответа, если запрос завершился без исключения
+            error: Исключение, если запрос завершился ошибкой
+            finish_reason: Причина завершения генерации из ответа API
+
+        Returns:
+            Задержка перед повтором в секундах или None, если ответ нужно вернуть
+
+        Raises:
+            Exception: Если ошибка неустранима или попытки исчерпаны
+        """
+        is_last_attempt = attempt == JSON_ERROR_MAX_RETRY - 1
+
+        if error is not None:
+            if is_last_attempt or not isinstance(
+                error, (JSONDecodeError, UnexpectedResponseError)
+            ):
+                self._raise_api_error(error)
+            retry_delay = _backoff(attempt, JSON_ERROR_RETRY_DELAY)
+            logger.warning(
+                "Model [%s] (%s attempt %d/%d): retrying in %.1fs. Error: %s",
+                self.model_name,
+                type(error).__name__,
+                attempt + 1,
+                JSON_ERROR_MAX_RETRY,
+                retry_delay,
+                error,
+            )
+            return retry_delay
+
+        if (
+            is_last_attempt
+            or finish_reason == "length"
+            or not (result and result.strip())
+            or not self.contains_error_patterns(result)
+        ):
+            return None
+
+        retry_delay = _backoff(attempt, JSON_ERROR_RETRY_DELAY)
+        logger.warning(
+            "Model [%s] (error pattern attempt %d/%d): retrying in %.1fs",
+            self.model_name,
+            attempt + 1,
+            JSON_ERROR_MAX_RETRY,
+            retry_delay,
+        )
+        return retry_delay
+
     def __call__(
         self, messages: List[Dict[str, str]], return_metadata: bool = False
     ) -> Union[str, Tuple[str, Dict[str, int]]]:
@@ -427,226 +1179,381 @@ class OaiSampler(SamplerBase):
         Raises:
             Exception: В случае ошибок при обращении к API
         """
+        cache_key, cached = self._lookup_cache(messages)
+        if cached is not None:
+            return cached if return_metadata else cached[0]
+
+        if cache_key is None:
+            result, metadata, _ = self._call_api(messages)
+        else:
+            result, metadata = self._call_api_shared(cache_key, messages)
+
+        if return_metadata:
+            return result, metadata
+        return result
+
+    def _call_api(
+        self, messages: List[Dict[str, str]]
+    ) -> Tuple[str, Dict[str, int], bool]:
+        """
+        Выполняет запрос к API с учетом ограничения скорости и повторных попыток.
+
+        Args:
+            messages: Список сообщений для диалога с моделью (без системного промпта)
+
+        Returns:
+            Кортеж (ответ, метаданные, успех); успех равен False, если API так и не
+            вернул ответ и вместо него возвращено сообщение об ошибке
+        """
         # Ждем, если нужно соблюдать ограничение скорости запросов
         self.rate_limiter.wait_if_needed()
 
-        if self.debug:
-            msg_preview = (
-                messages[0]["content"][:50] + "..."
-                if messages and len(messages[0]["content"]) > 50
-                else ""
-            )
-            logger.debug(
-                f"Sending request to {self.model_name}, first message: {msg_preview}"
-            )
+        messages = self._prepare_messages(messages)
 
-        # Добавляем system prompt если он есть
-        if self.system_prompt:
-            messages = [
-                self._pack_message(content=self.system_prompt, role="system")
-            ] + messages
-
-        # Для OpenAI API добавляем специальную обработку с повторами для JSONDecodeError
         if self.api_type != "gigachat":
-            for json_retry in range(JSON_ERROR_MAX_RETRY):
+            for attempt in range(JSON_ERROR_MAX_RETRY):
                 try:
-                    return self._process_openai_request(messages, return_metadata)
-                except Exception as e:
-                    # Проверяем, является ли ошибка JSONDecodeError или TypeError (для обработки некорректной структуры ответа)
-                    is_retryable_error = (
-                        isinstance(e, JSONDecodeError)
-                        or "JSONDecodeError" in str(e)
-                        or "Expecting value" in str(e)
-                        or isinstance(e, TypeError)
+                    result, metadata, finish_reason = self._process_openai_request(
+                        messages
                     )
+                except Exception as e:
+                    time.sleep(self._openai_retry_delay(attempt, error=e))
+                    continue
 
-                    if is_retryable_error:
-                        retry_delay = JSON_ERROR_RETRY_DELAY * (1 + json_retry * 0.5)
-                        logger.warning(
-                            f"Model [{self.model_name}] ({type(e).__name__} attempt {json_retry + 1}/{JSON_ERROR_MAX_RETRY}): retrying in {retry_delay:.1f}s. Error: {str(e)}"
-                        )
-                        time.sleep(retry_delay)
-                        # Если это не последняя попытка, продолжаем цикл
-                        if json_retry < JSON_ERROR_MAX_RETRY - 1:
-                            continue
-
-                    # Для всех других ошибок или если исчерпали попытки для JSONDecodeError/TypeError
-                    error_msg = f"API call error: {self.model_name}, {self.api_type}"
-                    if self.api_key:
-                        error_msg += f" (API key: {self.api_key[:4]}...)"
-                    elif self.credentials:
-                        error_msg += f" (using credentials for {self.api_type})"
-                    error_msg += f" - {type(e).__name__}: {str(e)}"
-
-                    logger.error(error_msg)
-                    raise Exception(
-                        f"API call failed for model {self.model_name}. Check logs for details."
-                    ) from e
+                retry_delay = self._openai_retry_delay(
+                    attempt, result=result, finish_reason=finish_reason
+                )
+                if retry_delay is None:
+                    break
+                time.sleep(retry_delay)
+            # Неустранимые ошибки OpenAI API выбрасываются как исключения
+            succeeded = True
         else:
             # Обработка для GigaChat остается без изменений
-            result, metadata = self.chat_completion_gigachat(
+            result, metadata, succeeded = self.chat_completion_gigachat(
                 model=self.model_name,
                 messages=messages,
                 temperature=self.temperature,
                 max_tokens=self.max_tokens,
+                return_status=True,
             )
 
-            if return_metadata:
-                return result, metadata
-            return result
+        return result, metadata, succeeded
 
-    def _process_openai_request(
+    def _call_api_shared(
+        self, cache_key: str, messages: List[Dict[str, str]]
+    ) -> Tuple[str, Dict[str, int]]:
+        """
+        Выполняет запрос к API, объединяя одновременные одинаковые запросы в один.
+
+        Первый поток с данным ключом выполняет запрос и сохраняет ответ в кэш,
+        остальные ждут его завершения и получают тот же ответ. Если ведущий
+        запрос завершился ошибкой, ожидающие потоки получают то же исключение,
+        а не повторяют запрос друг за другом.
+
+        Args:
+            cache_key: Ключ кэша, однозначно определяющий запрос
+            messages: Список сообщений для диалога с моделью (без системного промпта)
+
+        Returns:
+            Кортеж (ответ, метаданные)
+        """
+        with self._inflight_lock:
+            flight = self._inflight.get(cache_key)
+            is_leader = flight is None
+            if is_leader:
+                flight = self._inflight[cache_key] = (threading.Event(), [])
+        done, outcome = flight
+
+        if not is_leader:
+            done.wait()
+            status, value = outcome[0]
+            if status == "error":
+                raise value
+            result, metadata = value
+            return result, dict(metadata)
+
+        try:
+            # Предыдущий ведущий запрос мог завершиться между промахом кэша и захватом
+            # блокировки: его ответ уже в кэше, повторный вызов API не нужен
+            cached = self._response_cache.get(cache_key)
+            if cached is not None:
+                result, metadata = cached
+                outcome.append(("ok", (result, dict(metadata))))
+                return result, dict(metadata)
+
+            result, metadata, succeeded = self._call_api(messages)
+            # Сообщение о неудачном запросе не кэшируем, чтобы повторный запрос ушел в API
+            if succeeded:
+                self._store_in_cache(cache_key, result, metadata)
+            outcome.append(("ok", (result, dict(metadata))))
+            return result, metadata
+        except BaseException as exc:
+            outcome.append(("error", exc))
+            raise
+        finally:
+            with self._inflight_lock:
+                del self._inflight[cache_key]
+            done.set()
+
+    async def acall(
         self, messages: List[Dict[str, str]], return_metadata: bool = False
-    ):
+    ) -> Union[str, Tuple[str, Dict[str, int]]]:
+        """
+        Асинхронно отправляет запрос к API и возвращает ответ.
+
+        Для OpenAI-совместимых API использует openai.AsyncOpenAI, поэтому множество
+        запросов обслуживается одним циклом событий без отдельного потока на запрос.
+
+        Args:
+            messages: Список сообщений для диалога с моделью
+            return_metadata: Флаг для возврата метаданных (токены, задержки)
+
+        Returns:
+            При return_metadata=False: строка с ответом модели
+            При return_metadata=True: кортеж (ответ, метаданные)
+
+        Raises:
+            Exception: В случае ошибок при обращении к API
+        """
+        if self.api_type == "gigachat":
+            # Клиент GigaChat используется синхронно, поэтому запрос выполняется в потоке
+            return await asyncio.to_thread(self, messages, return_metadata)
+
+        cache_key, cached = self._lookup_cache(messages)
+        if cached is not None:
+            return cached if return_metadata else cached[0]
+
+        # Ждем, если нужно соблюдать ограничение скорости запросов
+        await self.rate_limiter.async_wait_if_needed()
+
+        messages = self._prepare_messages(messages)
+
+        for attempt in range(JSON_ERROR_MAX_RETRY):
+            try:
+                result, metadata, finish_reason = await self._aprocess_openai_request(
+                    messages
+                )
+            except Exception as e:
+                await asyncio.sleep(self._openai_retry_delay(attempt, error=e))
+                continue
+
+            retry_delay = self._openai_retry_delay(
+                attempt, result=result, finish_reason=finish_reason
+            )
+            if retry_delay is None:
+                break
+            await asyncio.sleep(retry_delay)
+
+        self._store_in_cache(cache_key, result, metadata)
+
+        if return_metadata:
+            return result, metadata
+        return result
+
+    async def abatch(
+        self,
+        batch: List[List[Dict[str, str]]],
+        return_metadata: bool = False,
+        concurrency: Optional[int] = None,
+    ) -> List[Union[str, Tuple[str, Dict[str, int]]]]:
+        """
+        Асинхронно выполняет набор запросов с ограничением числа одновременных запросов.
+
+        Args:
+            batch: Список диалогов, каждый из которых - список сообщений
+            return_metadata: Флаг для возврата метаданных (токены, задержки)
+            concurrency: Максимальное число одновременных запросов
+                (по умолчанию значение parallel из конфигурации модели)
+
+        Returns:
+            Список ответов в том же порядке, что и batch
+        """
+        semaphore = asyncio.Semaphore(concurrency or self.parallel)
+
+        async def run(messages: List[Dict[str, str]]):
+            async with semaphore:
+                return await self.acall(messages, return_metadata)
+
+        return await asyncio.gather(*(run(messages) for messages in batch))
+
+    def _raise_api_error(self, error: Exception) -> NoReturn:
+        """
+        Логирует неустранимую ошибку запроса к API и выбрасывает общее исключение.
+
+        Args:
+            error: Исходное исключение
+
+        Raises:
+            Exception: Всегда, с исходным исключением в качестве причины
+        """
+        if self.api_key:
+            auth_msg, auth_arg = " (API key: %s...)", self.api_key[:4]
+        elif self.credentials:
+            auth_msg, auth_arg = " (using credentials for %s)", self.api_type
+        else:
+            auth_msg, auth_arg = "%s", ""
+
+        logger.error(
+            "API call error: %s, %s" + auth_msg + " - %s: %s",
+            self.model_name,
+            self.api_type,
+            auth_arg,
+            type(error).__name__,
+            error,
+        )
+        raise Exception(
+            f"API call failed for model {self.model_name}. Check logs for details."
+        ) from error
+
+    def _openai_api_args(self, messages: List[Dict[str, str]]) -> Dict[str, Any]:
+        """
+        Собирает аргументы для запроса к OpenAI API.
+
+        Args:
+            messages: Список сообщений для отправки
+
+        Returns:
+            Словарь аргументов для chat.completions.create
+        """
+        return {**self._api_args_template, "messages": messages}
+
+    def _log_openai_error(self, error: Exception) -> None:
+        """
+        Логирует ошибку, возникшую при вызове OpenAI API.
+
+        Args:
+            error: Исключение, выброшенное клиентом API
+        """
+        # Подробно логируем только ошибки API
+        logger.error(
+            "Model [%s]: API error: %s: %s",
+            self.model_name,
+            type(error).__name__,
+            error,
+        )
+
+        # Логируем полный ответ API при ошибке
+        if logger.isEnabledFor(logging.ERROR):
+            error_json = {
+                "error_type": type(error).__name__,
+                "error_message": str(error),
+                "request_model": self.model_name,
+                "request_temperature": self.temperature,
+                "request_max_tokens": self.max_tokens,
+            }
+            logger.error("Error details: %s", _dumps(error_json))
+
+    def _process_openai_request(
+        self, messages: List[Dict[str, str]]
+    ) -> Tuple[str, Dict[str, int], Optional[str]]:
         """
         Обрабатывает запрос к OpenAI API и возвращает результат.
         Выделено в отдельный метод для более удобного механизма повторов.
+
+        Returns:
+            Кортеж (ответ, метаданные, finish_reason)
         """
-        # Prepare arguments for the API call
-        api_args = {
-            "model": self.model_name,
-            "messages": messages,
-            "temperature": self.temperature,
-        }
-        # Add max_tokens only if it has a value
-        if self.max_tokens is not None:
-            api_args["max_tokens"] = self.max_tokens
+        api_args = self._openai_api_args(messages)
 
         # Записываем только краткую информацию о запросе для OpenAI
-        logger.info(f"API request: [{self.model_name}]")
+        logger.info("API request: [%s]", self.model_name)
 
         try:
             response = self.client.chat.completions.create(**api_args)
         except Exception as e:
-            # Подробно логируем только ошибки API
-            logger.error(f"Model [{self.model_name}]: API error: {type(e).__name__}: {str(e)}")
-            
-            # Логируем полный ответ API при ошибке
-            error_json = {
-                "error_type": type(e).__name__,
-                "error_message": str(e),
-                "request_model": self.model_name,
-                "request_temperature": self.temperature,
-                "request_max_tokens": self.max_tokens,
-            }
-            logger.error(f"Error details: {json.dumps(error_json, ensure_ascii=False)}")
-            
+            self._log_openai_error(e)
             raise e
 
-        # Инициализируем метаданные
-        metadata: Dict[str, int] = {"total_tokens": 0}
+        return self._handle_openai_response(response)
 
-        # Извлекаем информацию о токенах из разных типов ответов
-        if hasattr(response, "usage") and response.usage:
-            metadata["prompt_tokens"] = getattr(response.usage, "prompt_tokens", 0)
-            metadata["completion_tokens"] = getattr(
-                response.usage, "completion_tokens", 0
-            )
-            metadata["total_tokens"] = getattr(response.usage, "total_tokens", 0)
-        elif isinstance(response, dict) and "usage" in response:
-            metadata["prompt_tokens"] = response["usage"].get("prompt_tokens", 0)
-            metadata["completion_tokens"] = response["usage"].get(
-                "completion_tokens", 0
-            )
-            metadata["total_tokens"] = response["usage"].get("total_tokens", 0)
+    async def _aprocess_openai_request(
+        self, messages: List[Dict[str, str]]
+    ) -> Tuple[str, Dict[str, int], Optional[str]]:
+        """
+        Асинхронный аналог _process_openai_request.
+        """
+        api_args = self._openai_api_args(messages)
+
+        # Записываем только краткую информацию о запросе для OpenAI
+        logger.info("API request: [%s]", self.model_name)
 
         try:
-            result: str = ""
-
-            # Стандартный путь для OpenAI API
-            # Добавляем проверку на None перед доступом к choices
-            if hasattr(response, "choices") and response.choices is not None and len(response.choices) > 0:
-                if hasattr(response.choices[0], "message") and hasattr(
-                    response.choices[0].message, "content"
-                ):
-                    result = response.choices[0].message.content
-
-                    # Проверяем содержимое ответа на наличие шаблонов ошибок
-                    if self.contains_error_patterns(result):
-                        error_msg = result.strip()
-                        log_content = (
-                            error_msg[:100] + "..."
-                            if len(error_msg) > 100
-                            else error_msg
-                        )
-                        logger.warning(
-                            f"Model [{self.model_name}]: Error pattern in response: {log_content}"
-                        )
-                        # Логируем полный ответ при обнаружении ошибки
-                        logger.warning(f"Full response: {safe_response_dump(response)}")
-                    else:
-                        # Для успешных запросов - только модель, статус и токены
-                        logger.info(f"Model [{self.model_name}]: Success, tokens: {metadata['total_tokens']}")
-
-                    if return_metadata:
-                        return result, metadata
-                    return result
-            # Добавляем проверку на None для словарного формата
-            elif isinstance(response, dict) and "choices" in response and response["choices"] is not None:
-                if len(response["choices"]) > 0:
-                    if (
-                        "message" in response["choices"][0]
-                        and "content" in response["choices"][0]["message"]
-                    ):
-                        result = response["choices"][0]["message"]["content"]
-
-                        # Проверяем содержимое ответа на наличие шаблонов ошибок
-                        if self.contains_error_patterns(result):
-                            error_msg = result.strip()
-                            log_content = (
-                                error_msg[:100] + "..."
-                                if len(error_msg) > 100
-                                else error_msg
-                            )
-                            logger.warning(
-                                f"Model [{self.model_name}]: Error pattern in response: {log_content}"
-                            )
-                            # Логируем полный ответ при обнаружении ошибки
-                            logger.warning(f"Full response: {safe_response_dump(response)}")
-                        else:
-                            # Для успешных запросов - только модель, статус и токены
-                            logger.info(f"Model [{self.model_name}]: Success, tokens: {metadata['total_tokens']}")
-
-                        if return_metadata:
-                            return result, metadata
-                        return result
-
-            # Если ничего не нашли, но есть response в строковом виде
-            if isinstance(response, str):
-                if return_metadata:
-                    return response, metadata
-                return response
-
-            # Последняя попытка получить ответ
-            if hasattr(response, "content"):
-                if return_metadata:
-                    return response.content, metadata
-                return response.content
-
-            # Если все методы не сработали, возвращаем строку с ошибкой формата
-            error_msg = (
-                f"Failed to extract response content. Response type: {type(response)}"
+            client = await self.get_async_openai_client(
+                self.api_key, self.base_url, self._openai_timeout
             )
-            logger.warning(
-                f"Model [{self.model_name}]: {error_msg}. Response dump: {safe_response_dump(response)}"
-            )
-            # Генерируем ошибку, чтобы вызвать повторную попытку в __call__
-            # Используем TypeError, так как он уже обрабатывается в __call__ для повторов
-            # или можно создать кастомный класс ошибки
-            raise TypeError(f"Unexpected response structure: {error_msg}")
+            response = await client.chat.completions.create(**api_args)
+        except Exception as e:
+            self._log_openai_error(e)
+            raise e
 
+        return self._handle_openai_response(response)
+
+    def _handle_openai_response(
+        self, response: Any
+    ) -> Tuple[str, Dict[str, int], Optional[str]]:
+        """
+        Извлекает текст ответа, метаданные и причину завершения из ответа OpenAI API.
+
+        Args:
+            response: Объект ответа API
+
+        Returns:
+            Кортеж (ответ, метаданные, finish_reason)
+        """
+        # Извлекаем информацию о токенах из разных типов ответов
+        metadata = _extract_usage(response)
 
+        try:
+            finish_reason = _extract_finish_reason(response)
+            # Стандартный путь для OpenAI API, остальные форматы разбираются отдельно
+            try:
+                result = response.choices[0].message.content
+            except (AttributeError, IndexError, KeyError, TypeError):
+                result = _extract_content_slow(response)
+
+            # Ответ обрезан по max_tokens: повтор при той же температуре его не изменит
+            if finish_reason == "length":
+                logger.warning(
+                    "Model [%s]: Response truncated by max_tokens (%s), tokens: %s",
+                    self.model_name,
+                    self.max_tokens,
+                    metadata["total_tokens"],
+                )
+            # Проверяем содержимое ответа на наличие шаблонов ошибок
+            elif self.contains_error_patterns(result):
+                error_msg = (result or "").strip()
+                log_content = (
+                    error_msg[:100] + "..." if len(error_msg) > 100 else error_msg
+                )
+                logger.warning(
+                    "Model [%s]: Error pattern in response: %s",
+                    self.model_name,
+                    log_content,
+                )
+                # Логируем полный ответ при обнаружении ошибки
+                logger.warning("Full response: %s", _LazyDump(response))
+            else:
+                # Для успешных запросов - только модель, статус и токены
+                logger.info(
+                    "Model [%s]: Success, tokens: %s",
+                    self.model_name,
+                    metadata["total_tokens"],
+                )
         except Exception as content_error:
             # Логируем ошибку извлечения контента
+            # Трассировку стека формирует обработчик логов и только в режиме отладки
             logger.error(
-                f"Model [{self.model_name}]: Error extracting content from response: {str(content_error)}"
+                "Model [%s]: Error extracting content from response: %s",
+                self.model_name,
+                content_error,
+                exc_info=self.debug,
             )
             logger.error(
-                f"Model [{self.model_name}]: Traceback: {traceback.format_exc()}"
-            )
-            logger.error(
-                f"Model [{self.model_name}]: Response dump: {safe_response_dump(response)}"
+                "Model [%s]: Response dump: %s", self.model_name, _LazyDump(response)
             )
 
             # Перебрасываем исключение, чтобы его мог поймать __call__ для повторной попытки
             raise content_error
+
+        return result, metadata, finish_reason